@@ -4,10 +4,18 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+import os
+import glob
+import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
 # Import insights module
 try:
     from insights import get_key_metrics, get_sales_trends, get_category_analysis, get_shipping_analysis
@@ -18,6 +26,46 @@ except ImportError:
     def get_category_analysis(df): return {}
     def get_shipping_analysis(df): return {}
 
+DATA_PATH = "data/amazon_sale_report.csv"
+
+CATEGORY_COLUMNS = ['Status', 'Sales Channel', 'Category', 'Fulfilment', 'Courier Status',
+                    'ship-state', 'ship-city', 'ship-country']
+
+# Bump whenever load_data() changes how the CSV is cleaned or typed
+CACHE_VERSION = 1
+# Typed columnar copy of the CSV, written on first load and reused on cold starts; the name
+# carries the load schema so a copy written by different load code is never read back
+PARQUET_PATH = "data/amazon_sale_report.v{}-{:08x}.parquet".format(
+    CACHE_VERSION, zlib.crc32(','.join(CATEGORY_COLUMNS).encode()))
+# Every cache copy, current or stale, including temp files left by interrupted writes
+PARQUET_PATTERN = "data/amazon_sale_report*.parquet*"
+
+# Sidebar filter columns, pre-aggregated together by build_cube()
+CUBE_DIMENSIONS = ['Status', 'Sales Channel', 'Category', 'ship-state']
+CUBE_MEASURES = ['Amount', 'Qty']
+CROSSTAB_COLUMNS = ['Fulfilment', 'Courier Status']
+
+# Shared dark styling applied to every chart
+px.defaults.template = "plotly_dark"
+DARK_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='white')
+)
+
+def styled(fig, **extra):
+    return fig.update_layout(**DARK_LAYOUT, **extra)
+
+# Charts without an explicit "Top N" keep at most this many marks (fewer for
+# pies) and fold the remainder into a single "Other" entry
+TOP_K = 15
+PIE_TOP_K = 10
+
+def top_k(series, k=TOP_K):
+    if len(series) <= k:
+        return series
+    return pd.concat([series.head(k), pd.Series({'Other': series.iloc[k:].sum()})])
+
 # Page configuration
 st.set_page_config(
     page_title="Amazon Sales Analytics Dashboard",
@@ -27,30 +75,24 @@ st.set_page_config(
 )
 
 # Custom CSS for dark gradient theme
- 
-import pandas as pd
-import plotly.express as px
-import insights  # your insights.py module
-
-# ========== DARK THEME FIX ==========
-st.markdown("""
-    <style>
-        /* Page background and text */
-        body, .stApp {
-            background-color: #0c1426;
-            color: white;
-        }
-
-        /* Headers */
-        h1, h2, h3, h4, h5, h6 {
-            color: #ffffff !important;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        }
-
-        /* Sidebar text */
-        .css-1aumxhk, .css-18e3th9, .css-1d391kg, .css-1v0mbdj, .css-1cpxqw2 {
-            color: white !important;
-        }
+APP_CSS = """
+<style>
+    /* Page background and text */
+    body, .stApp {
+        background-color: #0c1426;
+        color: white;
+    }
+    
+    /* Headers */
+    h1, h2, h3, h4, h5, h6 {
+        color: #ffffff !important;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    }
+    
+    /* Sidebar text */
+    .css-1aumxhk, .css-18e3th9, .css-1d391kg, .css-1v0mbdj, .css-1cpxqw2 {
+        color: white !important;
+    }
     
     .metric-card {
         background: linear-gradient(135deg, #1e3a5f, #2d5a87);
@@ -80,11 +122,6 @@ st.markdown("""
         color: white;
     }
     
-    h1, h2, h3 {
-        color: #ffffff;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-    }
-    
     .stTabs [data-baseweb="tab-list"] {
         gap: 8px;
     }
@@ -102,13 +139,421 @@ st.markdown("""
         box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-@st.cache_data
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+def read_parquet_cache():
+    # None when there is no usable copy: missing, older than the CSV or unreadable
+    if not os.path.exists(PARQUET_PATH) or os.path.getmtime(PARQUET_PATH) < os.path.getmtime(DATA_PATH):
+        return None
+    try:
+        return pd.read_parquet(PARQUET_PATH)
+    except Exception as e:
+        logger.warning("Ignoring unreadable data cache %s: %s", PARQUET_PATH, e)
+        return None
+
+def write_parquet_cache(df):
+    # Written beside the target and renamed into place, so an interrupted write
+    # never leaves a truncated file that looks newer than the CSV
+    tmp_path = f"{PARQUET_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, PARQUET_PATH)
+    except Exception as e:
+        logger.warning("Could not write data cache %s: %s", PARQUET_PATH, e)
+    
+    # A failed write's temp file and copies written under an older CACHE_VERSION or
+    # column list are never read again
+    for path in glob.glob(PARQUET_PATTERN):
+        if os.path.abspath(path) != os.path.abspath(PARQUET_PATH):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+# The base frame is shared across sessions; it must never be mutated in place
+@st.cache_resource
 def load_data():
-    df = pd.read_csv("data/amazon_sale_report.csv")
+    df = read_parquet_cache()
+    if df is not None:
+        return df
+    
+    df = pd.read_csv(DATA_PATH, engine='pyarrow')
     df.columns = df.columns.str.strip()
+    
+    # Low-cardinality string columns are stored as categoricals so that filters
+    # and aggregations run on integer codes instead of Python strings
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    # 32-bit measures halve the bytes every reduction has to stream; totals are
+    # still accumulated in 64 bits where they are displayed
+    if 'Amount' in df.columns:
+        df['Amount'] = pd.to_numeric(df['Amount'], downcast='float')
+    if 'Qty' in df.columns and pd.api.types.is_integer_dtype(df['Qty']):
+        df['Qty'] = df['Qty'].astype('int32')
+    
+    # Parquet keeps the categorical dtypes, so later loads skip parsing entirely
+    write_parquet_cache(df)
+    
     return df
+
+# Sidebar choices come straight from the categorical dtype instead of a
+# unique() scan over the column
+@st.cache_data
+def filter_options(col):
+    values = load_data()[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return ['All'] + values.cat.categories.tolist()
+    return ['All'] + list(values.unique())
+
+def match_values(column, values):
+    # Categorical columns test membership with one lookup-table gather over the
+    # integer codes; the trailing False entry catches missing values (code -1)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        table = np.append(column.cat.categories.isin(values), False)
+        return table[column.cat.codes.to_numpy()]
+    return column.isin(values).to_numpy()
+
+def filter_mask(frame, status, channel, categories, states):
+    # AND the active predicates into one mask; None means nothing is filtered
+    predicates = []
+    
+    if status != 'All':
+        predicates.append(('Status', [status]))
+    
+    if channel != 'All':
+        predicates.append(('Sales Channel', [channel]))
+    
+    if 'All' not in categories:
+        predicates.append(('Category', categories))
+    
+    if 'All' not in states:
+        predicates.append(('ship-state', states))
+    
+    mask = None
+    for col, values in predicates:
+        if col in frame.columns:
+            matched = match_values(frame[col], values)
+            mask = matched if mask is None else mask & matched
+    
+    return mask
+
+def apply_filters(frame, filters):
+    mask = filter_mask(frame, *filters)
+    return frame if mask is None else frame[mask]
+
+# Per-column dtype and deep memory usage of the base frame, measured once so the
+# Data Explorer does not rescan every string column of the filtered frame
+@st.cache_resource
+def column_metadata():
+    df = load_data()
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'memory': df.memory_usage(deep=True, index=False),
+        'object': [pd.api.types.is_object_dtype(dtype) for dtype in df.dtypes]
+    })
+
+def estimate_memory_usage(filtered_df):
+    # Fixed-width columns are measured exactly; object columns are scaled from
+    # the base frame by the share of rows that survived the filters
+    meta = column_metadata()
+    base_rows = len(load_data())
+    share = len(filtered_df) / base_rows if base_rows else 0
+    usage = filtered_df.memory_usage(deep=False).astype('float64')
+    for col in meta.index[meta['object']]:
+        usage[col] = meta.at[col, 'memory'] * share
+    return usage.sum()
+
+# Filtering and aggregations are cached on the hashable filter signature
+# (status, channel, categories, states) so reruns with unchanged filters skip pandas.
+# A filtered frame can be as large as the base frame, so only the most recent
+# signatures keep theirs; the small tables derived from them are kept longer
+FRAME_CACHE_ENTRIES = 8
+FRAME_CACHE_TTL = 600
+TABLE_CACHE_ENTRIES = 64
+
+@st.cache_data(max_entries=FRAME_CACHE_ENTRIES, ttl=FRAME_CACHE_TTL)
+def compute_filtered(status, channel, categories, states):
+    return apply_filters(load_data(), (status, channel, categories, states))
+
+def grouped_sum(frame, by, col):
+    # Sum col per category of by with one np.bincount over the integer codes,
+    # skipping pandas' generic groupby machinery; same result as
+    # frame.groupby(by, observed=True)[col].sum()
+    if not isinstance(frame[by].dtype, pd.CategoricalDtype):
+        return frame.groupby(by, observed=True)[col].sum()
+    
+    codes = frame[by].cat.codes.to_numpy()
+    observed = codes >= 0
+    codes = codes[observed]
+    values = frame[col].to_numpy(dtype='float64', na_value=0.0)[observed]
+    categories = frame[by].cat.categories
+    
+    sums = pd.Series(np.bincount(codes, weights=values, minlength=len(categories)), index=categories, name=col)
+    sums = sums[np.bincount(codes, minlength=len(categories)) > 0]
+    if pd.api.types.is_integer_dtype(frame[col]):
+        sums = sums.astype('int64')
+    sums.index.name = by
+    return sums
+
+# Data Explorer tables, cached per filter signature so unrelated interactions
+# reuse them instead of rebuilding them from the filtered frame
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def column_info(filters):
+    # dtypes never change with the filters and null counts follow from the
+    # single non-null pass; plain arrays keep the constructor from aligning
+    filtered_df = compute_filtered(*filters)
+    non_null = filtered_df.count().to_numpy()
+    return pd.DataFrame({
+        'Column': filtered_df.columns.to_numpy(),
+        'Data Type': column_metadata()['dtype'].to_numpy(),
+        'Non-Null Count': non_null,
+        'Null Count': len(filtered_df) - non_null
+    })
+
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def preview_rows(filters):
+    return compute_filtered(*filters).head(100)
+
+# Serialised download of the filtered rows, built once per filter signature
+# rather than on every rerun
+@st.cache_data(max_entries=FRAME_CACHE_ENTRIES, ttl=300)
+def filtered_csv(filters):
+    return compute_filtered(*filters).to_csv(index=False).encode('utf-8')
+
+# Order count, revenue and quantity per combination of the filter columns. The
+# cube is far smaller than the raw frame, so aggregations over the filter
+# columns slice the cube instead of rescanning every row
+@st.cache_resource
+def build_cube():
+    df = load_data()
+    dims = [col for col in CUBE_DIMENSIONS if col in df.columns]
+    # Widen the downcast measures so the cube sums stay exact
+    measures = {col: df[col].astype(np.float64 if df[col].dtype.kind == 'f' else np.int64)
+                for col in CUBE_MEASURES if col in df.columns}
+    grouped = df[dims].assign(**measures).groupby(dims, observed=True, dropna=False)
+    
+    cube = grouped.size().to_frame('orders')
+    for col in measures:
+        cube[col] = grouped[col].sum()
+    
+    return cube.reset_index()
+
+# Order counts of one low-cardinality tab column per combination of the filter
+# columns, a small crosstab sliced like the cube
+@st.cache_resource
+def build_crosstab(col):
+    df = load_data()
+    dims = [dim for dim in CUBE_DIMENSIONS if dim in df.columns]
+    return df.groupby(dims + [col], observed=True, dropna=False).size().rename('orders').reset_index()
+
+def cube_view(filters):
+    return apply_filters(build_cube(), filters)
+
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def agg_value_counts(filters, col):
+    if col in CUBE_DIMENSIONS and col in build_cube().columns:
+        counts = grouped_sum(cube_view(filters), col, 'orders').sort_values(ascending=False)
+    elif col in CROSSTAB_COLUMNS and col in load_data().columns:
+        counts = grouped_sum(apply_filters(build_crosstab(col), filters), col, 'orders').sort_values(ascending=False)
+    else:
+        # Columns too wide to pre-aggregate, such as ship-city, are counted on the filtered rows
+        counts = compute_filtered(*filters)[col].value_counts()
+    # Categorical counts also list categories that were filtered out
+    return counts[counts > 0]
+
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def agg_groupby_sum(filters, by, col):
+    if by in CUBE_DIMENSIONS and col in CUBE_MEASURES and col in build_cube().columns:
+        source = cube_view(filters)
+    else:
+        source = compute_filtered(*filters)
+    return grouped_sum(source, by, col).sort_values(ascending=False)
+
+@st.cache_data(max_entries=TABLE_CACHE_ENTRIES)
+def agg_nunique(filters, col):
+    if col in CUBE_DIMENSIONS and col in build_cube().columns:
+        return cube_view(filters)[col].nunique()
+    return compute_filtered(*filters)[col].nunique()
+
+# Chart builders cache the finished figure per filter signature, so a rerun with
+# unchanged filters reuses it instead of rebuilding it through Plotly Express.
+# cache_resource hands back the same object; callers must not modify it
+FIGURE_CACHE_ENTRIES = 64
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def status_chart(filters):
+    status_counts = top_k(agg_value_counts(filters, 'Status'), PIE_TOP_K)
+    return styled(
+        px.pie(
+            values=status_counts.values,
+            names=status_counts.index,
+            title="Orders by Status",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def channel_chart(filters):
+    channel_counts = top_k(agg_value_counts(filters, 'Sales Channel'))
+    return styled(
+        px.bar(
+            x=channel_counts.index,
+            y=channel_counts.values,
+            title="Orders by Sales Channel",
+            color=channel_counts.values,
+            color_continuous_scale="Blues"
+        ),
+        xaxis=dict(title="Sales Channel"),
+        yaxis=dict(title="Number of Orders")
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def category_revenue_chart(filters):
+    category_revenue = top_k(agg_groupby_sum(filters, 'Category', 'Amount'))
+    return styled(
+        px.bar(
+            x=category_revenue.index,
+            y=category_revenue.values,
+            title="Revenue by Category",
+            color=category_revenue.values,
+            color_continuous_scale="Viridis"
+        ),
+        xaxis=dict(title="Category"),
+        yaxis=dict(title="Revenue ($)")
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def state_revenue_chart(filters):
+    state_revenue = agg_groupby_sum(filters, 'ship-state', 'Amount').head(10)
+    return styled(
+        px.bar(
+            x=state_revenue.values,
+            y=state_revenue.index,
+            orientation='h',
+            title="Top 10 States by Revenue",
+            color=state_revenue.values,
+            color_continuous_scale="Plasma"
+        ),
+        xaxis=dict(title="Revenue ($)"),
+        yaxis=dict(title="State")
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def category_qty_chart(filters):
+    cat_qty = agg_groupby_sum(filters, 'Category', 'Qty').head(10)
+    return styled(
+        px.treemap(
+            names=cat_qty.index,
+            values=cat_qty.values,
+            title="Product Categories by Quantity Sold",
+            color=cat_qty.values,
+            color_continuous_scale="RdYlBu"
+        )
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def category_dist_chart(filters):
+    cat_dist = agg_value_counts(filters, 'Category').head(10)
+    return styled(
+        px.pie(
+            values=cat_dist.values,
+            names=cat_dist.index,
+            title="Top 10 Categories by Order Count",
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fulfillment_chart(filters):
+    fulfillment_counts = top_k(agg_value_counts(filters, 'Fulfilment'), PIE_TOP_K)
+    return styled(
+        px.pie(
+            values=fulfillment_counts.values,
+            names=fulfillment_counts.index,
+            title="Orders by Fulfillment Type",
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def courier_chart(filters):
+    courier_counts = top_k(agg_value_counts(filters, 'Courier Status'))
+    return styled(
+        px.bar(
+            x=courier_counts.index,
+            y=courier_counts.values,
+            title="Orders by Courier Status",
+            color=courier_counts.values,
+            color_continuous_scale="Oranges"
+        ),
+        xaxis=dict(title="Courier Status"),
+        yaxis=dict(title="Number of Orders")
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def state_orders_chart(filters):
+    state_counts = agg_value_counts(filters, 'ship-state').head(15)
+    return styled(
+        px.bar(
+            x=state_counts.values,
+            y=state_counts.index,
+            orientation='h',
+            title="Top 15 States by Order Count",
+            color=state_counts.values,
+            color_continuous_scale="Viridis"
+        ),
+        xaxis=dict(title="Number of Orders"),
+        yaxis=dict(title="State")
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def city_orders_chart(filters):
+    city_counts = agg_value_counts(filters, 'ship-city').head(15)
+    return styled(
+        px.bar(
+            x=city_counts.values,
+            y=city_counts.index,
+            orientation='h',
+            title="Top 15 Cities by Order Count",
+            color=city_counts.values,
+            color_continuous_scale="Plasma"
+        ),
+        xaxis=dict(title="Number of Orders"),
+        yaxis=dict(title="City")
+    )
+
+# Aggregations behind the tab charts, as (function, column arguments) pairs
+CHART_AGGREGATES = [
+    (agg_value_counts, ('Status',)),
+    (agg_value_counts, ('Sales Channel',)),
+    (agg_groupby_sum, ('Category', 'Amount')),
+    (agg_groupby_sum, ('ship-state', 'Amount')),
+    (agg_groupby_sum, ('Category', 'Qty')),
+    (agg_value_counts, ('Category',)),
+    (agg_value_counts, ('Fulfilment',)),
+    (agg_value_counts, ('Courier Status',)),
+    (agg_value_counts, ('ship-state',)),
+    (agg_value_counts, ('ship-city',)),
+]
+
+def prefetch_aggregates(filters, columns):
+    # The aggregations are independent, so cache misses run concurrently; the
+    # figures are then built on the script thread because Plotly Express is not
+    # thread-safe. Workers carry the script context so the caches behave as usual
+    with ThreadPoolExecutor(max_workers=4, initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as executor:
+        futures = [
+            executor.submit(func, filters, *args)
+            for func, args in CHART_AGGREGATES
+            if all(col in columns for col in args)
+        ]
+    for future in futures:
+        future.result()
+
 def main():
     # Header
     st.markdown('<div class="main-header">', unsafe_allow_html=True)
@@ -121,6 +566,9 @@ def main():
     if df is None:
         return
     
+    # Filtering never drops columns, so one set serves every membership check
+    cols = frozenset(df.columns)
+    
     # Sidebar filters
     st.sidebar.markdown("## 🔍 Filters & Controls")
     
@@ -128,47 +576,38 @@ def main():
     date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
     
     # Status filter
-    if 'Status' in df.columns:
-        status_options = ['All'] + list(df['Status'].unique())
+    if 'Status' in cols:
+        status_options = filter_options('Status')
         selected_status = st.sidebar.selectbox("📋 Order Status", status_options)
     else:
         selected_status = 'All'
     
     # Sales Channel filter
-    if 'Sales Channel' in df.columns:
-        channel_options = ['All'] + list(df['Sales Channel'].unique())
+    if 'Sales Channel' in cols:
+        channel_options = filter_options('Sales Channel')
         selected_channel = st.sidebar.selectbox("📱 Sales Channel", channel_options)
     else:
         selected_channel = 'All'
     
     # Category filter
-    if 'Category' in df.columns:
-        category_options = ['All'] + list(df['Category'].unique())
+    if 'Category' in cols:
+        category_options = filter_options('Category')
         selected_categories = st.sidebar.multiselect("🏷️ Categories", category_options, default=['All'])
     else:
         selected_categories = ['All']
     
     # Ship State filter
-    if 'ship-state' in df.columns:
-        state_options = ['All'] + list(df['ship-state'].unique())
+    if 'ship-state' in cols:
+        state_options = filter_options('ship-state')
         selected_states = st.sidebar.multiselect("🗺️ Ship States", state_options, default=['All'])
     else:
         selected_states = ['All']
     
     # Apply filters
-    filtered_df = df.copy()
-    
-    if selected_status != 'All' and 'Status' in df.columns:
-        filtered_df = filtered_df[filtered_df['Status'] == selected_status]
-    
-    if selected_channel != 'All' and 'Sales Channel' in df.columns:
-        filtered_df = filtered_df[filtered_df['Sales Channel'] == selected_channel]
+    filters = (selected_status, selected_channel, tuple(selected_categories), tuple(selected_states))
+    filtered_df = compute_filtered(*filters)
     
-    if 'All' not in selected_categories and 'Category' in df.columns:
-        filtered_df = filtered_df[filtered_df['Category'].isin(selected_categories)]
-    
-    if 'All' not in selected_states and 'ship-state' in df.columns:
-        filtered_df = filtered_df[filtered_df['ship-state'].isin(selected_states)]
+    prefetch_aggregates(filters, cols)
     
     # Key Metrics Row
     st.markdown("## 📊 Key Performance Indicators")
@@ -182,8 +621,8 @@ def main():
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
-        if 'Amount' in filtered_df.columns:
-            total_revenue = filtered_df['Amount'].sum()
+        if 'Amount' in cols:
+            total_revenue = np.nansum(filtered_df['Amount'].to_numpy(), dtype=np.float64)
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("💰 Total Revenue", f"${total_revenue:,.2f}")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -193,8 +632,8 @@ def main():
             st.markdown('</div>', unsafe_allow_html=True)
     
     with col3:
-        if 'Amount' in filtered_df.columns and len(filtered_df) > 0:
-            avg_order_value = filtered_df['Amount'].mean()
+        if 'Amount' in cols and len(filtered_df) > 0:
+            avg_order_value = np.nanmean(filtered_df['Amount'].to_numpy(), dtype=np.float64)
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("📈 Avg Order Value", f"${avg_order_value:.2f}")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -204,8 +643,8 @@ def main():
             st.markdown('</div>', unsafe_allow_html=True)
     
     with col4:
-        if 'Category' in filtered_df.columns:
-            unique_categories = filtered_df['Category'].nunique()
+        if 'Category' in cols:
+            unique_categories = agg_nunique(filters, 'Category')
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("🏷️ Product Categories", f"{unique_categories}")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -224,135 +663,46 @@ def main():
         
         with col1:
             # Sales by Status
-            if 'Status' in filtered_df.columns:
-                status_counts = filtered_df['Status'].value_counts()
-                fig_status = px.pie(
-                    values=status_counts.values,
-                    names=status_counts.index,
-                    title="Orders by Status",
-                    color_discrete_sequence=px.colors.qualitative.Set3,
-                    template="plotly_dark"
-                )
-                fig_status.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white')
-                )
-                st.plotly_chart(fig_status, use_container_width=True)
+            if 'Status' in cols:
+                st.plotly_chart(status_chart(filters), use_container_width=True)
         
         with col2:
             # Sales by Channel
-            if 'Sales Channel' in filtered_df.columns:
-                channel_counts = filtered_df['Sales Channel'].value_counts()
-                fig_channel = px.bar(
-                    x=channel_counts.index,
-                    y=channel_counts.values,
-                    title="Orders by Sales Channel",
-                    color=channel_counts.values,
-                    color_continuous_scale="Blues",
-                    template="plotly_dark"
-                )
-                fig_channel.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    xaxis=dict(title="Sales Channel"),
-                    yaxis=dict(title="Number of Orders")
-                )
-                st.plotly_chart(fig_channel, use_container_width=True)
+            if 'Sales Channel' in cols:
+                st.plotly_chart(channel_chart(filters), use_container_width=True)
         
         # Revenue analysis if Amount column exists
-        if 'Amount' in filtered_df.columns:
+        if 'Amount' in cols:
             st.markdown("### 💰 Revenue Analysis")
             
             col1, col2 = st.columns(2)
             
             with col1:
                 # Revenue by Category
-                if 'Category' in filtered_df.columns:
-                    category_revenue = filtered_df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-                    fig_cat_rev = px.bar(
-                        x=category_revenue.index,
-                        y=category_revenue.values,
-                        title="Revenue by Category",
-                        color=category_revenue.values,
-                        color_continuous_scale="Viridis",
-                        template="plotly_dark"
-                    )
-                    fig_cat_rev.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='white'),
-                        xaxis=dict(title="Category"),
-                        yaxis=dict(title="Revenue ($)")
-                    )
-                    st.plotly_chart(fig_cat_rev, use_container_width=True)
+                if 'Category' in cols:
+                    st.plotly_chart(category_revenue_chart(filters), use_container_width=True)
             
             with col2:
                 # Revenue by State
-                if 'ship-state' in filtered_df.columns:
-                    state_revenue = filtered_df.groupby('ship-state')['Amount'].sum().sort_values(ascending=False).head(10)
-                    fig_state_rev = px.bar(
-                        x=state_revenue.values,
-                        y=state_revenue.index,
-                        orientation='h',
-                        title="Top 10 States by Revenue",
-                        color=state_revenue.values,
-                        color_continuous_scale="Plasma",
-                        template="plotly_dark"
-                    )
-                    fig_state_rev.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='white'),
-                        xaxis=dict(title="Revenue ($)"),
-                        yaxis=dict(title="State")
-                    )
-                    st.plotly_chart(fig_state_rev, use_container_width=True)
+                if 'ship-state' in cols:
+                    st.plotly_chart(state_revenue_chart(filters), use_container_width=True)
     
     with tab2:
         st.markdown("### 🏷️ Category Performance Analysis")
         
-        if 'Category' in filtered_df.columns:
+        if 'Category' in cols:
             category_analysis = get_category_analysis(filtered_df)
             
             col1, col2 = st.columns(2)
             
             with col1:
                 # Top categories by quantity
-                if 'Qty' in filtered_df.columns:
-                    cat_qty = filtered_df.groupby('Category')['Qty'].sum().sort_values(ascending=False).head(10)
-                    fig_cat_qty = px.treemap(
-                        names=cat_qty.index,
-                        values=cat_qty.values,
-                        title="Product Categories by Quantity Sold",
-                        color=cat_qty.values,
-                        color_continuous_scale="RdYlBu",
-                        template="plotly_dark"
-                    )
-                    fig_cat_qty.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='white')
-                    )
-                    st.plotly_chart(fig_cat_qty, use_container_width=True)
+                if 'Qty' in cols:
+                    st.plotly_chart(category_qty_chart(filters), use_container_width=True)
             
             with col2:
                 # Category distribution
-                cat_dist = filtered_df['Category'].value_counts().head(10)
-                fig_cat_dist = px.pie(
-                    values=cat_dist.values,
-                    names=cat_dist.index,
-                    title="Top 10 Categories by Order Count",
-                    color_discrete_sequence=px.colors.qualitative.Pastel,
-                    template="plotly_dark"
-                )
-                fig_cat_dist.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white')
-                )
-                st.plotly_chart(fig_cat_dist, use_container_width=True)
+                st.plotly_chart(category_dist_chart(filters), use_container_width=True)
     
     with tab3:
         st.markdown("### 🚚 Shipping & Fulfillment Analysis")
@@ -361,91 +711,28 @@ def main():
         
         with col1:
             # Fulfillment analysis
-            if 'Fulfilment' in filtered_df.columns:
-                fulfillment_counts = filtered_df['Fulfilment'].value_counts()
-                fig_fulfillment = px.pie(
-                    values=fulfillment_counts.values,
-                    names=fulfillment_counts.index,
-                    title="Orders by Fulfillment Type",
-                    color_discrete_sequence=px.colors.qualitative.Set2,
-                    template="plotly_dark"
-                )
-                fig_fulfillment.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white')
-                )
-                st.plotly_chart(fig_fulfillment, use_container_width=True)
+            if 'Fulfilment' in cols:
+                st.plotly_chart(fulfillment_chart(filters), use_container_width=True)
         
         with col2:
             # Courier analysis
-            if 'Courier Status' in filtered_df.columns:
-                courier_counts = filtered_df['Courier Status'].value_counts()
-                fig_courier = px.bar(
-                    x=courier_counts.index,
-                    y=courier_counts.values,
-                    title="Orders by Courier Status",
-                    color=courier_counts.values,
-                    color_continuous_scale="Oranges",
-                    template="plotly_dark"
-                )
-                fig_courier.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    xaxis=dict(title="Courier Status"),
-                    yaxis=dict(title="Number of Orders")
-                )
-                st.plotly_chart(fig_courier, use_container_width=True)
+            if 'Courier Status' in cols:
+                st.plotly_chart(courier_chart(filters), use_container_width=True)
     
     with tab4:
         st.markdown("### 🗺️ Geographic Sales Distribution")
         
-        if 'ship-state' in filtered_df.columns:
+        if 'ship-state' in cols:
             col1, col2 = st.columns(2)
             
             with col1:
                 # State distribution
-                state_counts = filtered_df['ship-state'].value_counts().head(15)
-                fig_states = px.bar(
-                    x=state_counts.values,
-                    y=state_counts.index,
-                    orientation='h',
-                    title="Top 15 States by Order Count",
-                    color=state_counts.values,
-                    color_continuous_scale="Viridis",
-                    template="plotly_dark"
-                )
-                fig_states.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    xaxis=dict(title="Number of Orders"),
-                    yaxis=dict(title="State")
-                )
-                st.plotly_chart(fig_states, use_container_width=True)
+                st.plotly_chart(state_orders_chart(filters), use_container_width=True)
             
             with col2:
                 # City distribution
-                if 'ship-city' in filtered_df.columns:
-                    city_counts = filtered_df['ship-city'].value_counts().head(15)
-                    fig_cities = px.bar(
-                        x=city_counts.values,
-                        y=city_counts.index,
-                        orientation='h',
-                        title="Top 15 Cities by Order Count",
-                        color=city_counts.values,
-                        color_continuous_scale="Plasma",
-                        template="plotly_dark"
-                    )
-                    fig_cities.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='white'),
-                        xaxis=dict(title="Number of Orders"),
-                        yaxis=dict(title="City")
-                    )
-                    st.plotly_chart(fig_cities, use_container_width=True)
+                if 'ship-city' in cols:
+                    st.plotly_chart(city_orders_chart(filters), use_container_width=True)
     
     with tab5:
         st.markdown("### 📋 Data Explorer")
@@ -457,30 +744,22 @@ def main():
         with col1:
             st.metric("📄 Total Rows", len(filtered_df))
         with col2:
-            st.metric("📊 Total Columns", len(filtered_df.columns))
+            st.metric("📊 Total Columns", len(cols))
         with col3:
-            st.metric("💾 Memory Usage", f"{filtered_df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+            st.metric("💾 Memory Usage", f"{estimate_memory_usage(filtered_df) / 1024**2:.2f} MB")
         
         # Column information
         st.markdown("#### 🔍 Column Information")
-        col_info = pd.DataFrame({
-            'Column': filtered_df.columns,
-            'Data Type': filtered_df.dtypes.astype(str),
-            'Non-Null Count': filtered_df.count(),
-            'Null Count': filtered_df.isnull().sum()
-        }).reset_index(drop=True)
-        
-        st.dataframe(col_info, use_container_width=True)
+        st.dataframe(column_info(filters), use_container_width=True)
         
         # Sample data
         st.markdown("#### 📋 Sample Data")
-        st.dataframe(filtered_df.head(100), use_container_width=True)
+        st.dataframe(preview_rows(filters), use_container_width=True)
         
         # Download filtered data
-        csv = filtered_df.to_csv(index=False)
         st.download_button(
             label="📥 Download Filtered Data",
-            data=csv,
+            data=filtered_csv(filters),
             file_name=f'filtered_amazon_sales_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
             mime='text/csv'
         )
@@ -1,56 +1,292 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import cached_property
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-def get_key_metrics(df):
+def _amount_summary(df):
+    """
+    Summary statistics of the Amount column from a single NumPy extraction
+    """
+    values = df['Amount'].to_numpy(dtype='float64', na_value=np.nan)
+    values = values[~np.isnan(values)]
+    
+    if values.size == 0:
+        return {'values': values, 'sum': 0.0, 'mean': np.nan, 'std': np.nan, 'min': np.nan, 'max': np.nan,
+                'q25': np.nan, 'q50': np.nan, 'q75': np.nan, 'q90': np.nan}
+    
+    total, mean = values.sum(), values.mean()
+    std = values.std(ddof=1) if values.size > 1 else np.nan
+    
+    # values is already a private copy, so let the quantile partition it in place
+    q25, q50, q75, q90 = np.quantile(values, [0.25, 0.5, 0.75, 0.9], overwrite_input=True)
+    return {
+        'values': values,
+        'sum': total,
+        'mean': mean,
+        'std': std,
+        'min': values.min(),
+        'max': values.max(),
+        'q25': q25,
+        'q50': q50,
+        'q75': q75,
+        'q90': q90
+    }
+
+class _AnalysisContext:
+    """
+    Values shared by the analyses of one frame within a single call: row count, Amount and Qty
+    summaries (Amount's totals separately from its spread and quantiles), and per-column codes
+    and counts, each computed on first use
+    """
+    def __init__(self, df):
+        self.df = df
+        self.n = len(df)
+        # ('codes' | 'counts', column) and column -> memoized codes, bincounts and value counts;
+        # lives only as long as the call that built the context, so frame edits are never missed
+        self.memo = {}
+    
+    @cached_property
+    def amount(self):
+        return _amount_summary(self.df) if 'Amount' in self.df.columns else None
+    
+    @cached_property
+    def amount_totals(self):
+        # Sum and mean only, for callers that need neither the spread nor the quantiles
+        if 'Amount' not in self.df.columns:
+            return None
+        values = self.df['Amount'].dropna().to_numpy(dtype='float64')
+        return {'sum': values.sum(), 'mean': values.mean() if values.size else np.nan}
+    
+    @cached_property
+    def qty(self):
+        if 'Qty' not in self.df.columns:
+            return None
+        values = self.df['Qty'].dropna().to_numpy()
+        return {'sum': values.sum(), 'mean': values.mean() if values.size else np.nan}
+
+def _codes(ctx, col):
+    """
+    Memoized integer codes (-1 for missing) and distinct values of a column; the one hashing
+    pass every count, group and distinct-value lookup on the column is built from
+    """
+    key = ('codes', col)
+    if key not in ctx.memo:
+        series = ctx.df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            ctx.memo[key] = (series.cat.codes.to_numpy(), series.cat.categories)
+        else:
+            ctx.memo[key] = pd.factorize(series)
+    return ctx.memo[key]
+
+def _count_codes(ctx, col):
+    """
+    Memoized occurrences of every distinct value from one bincount over the codes, with the values
+    """
+    codes, uniques = _codes(ctx, col)
+    key = ('counts', col)
+    if key not in ctx.memo:
+        ctx.memo[key] = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return ctx.memo[key], uniques
+
+def _value_counts(ctx, col):
+    """
+    Memoized df[col].value_counts(), shared by every analysis run with the same context
+    """
+    if col not in ctx.memo:
+        counts, uniques = _count_codes(ctx, col)
+        result = pd.Series(counts, index=uniques.rename(col), name='count')
+        # Unobserved categories count zero; ties keep code order, as value_counts does
+        ctx.memo[col] = result[result > 0].sort_values(ascending=False, kind='stable')
+    return ctx.memo[col]
+
+def _nunique(ctx, col):
+    """
+    Number of distinct non-missing values of a column, from its memoized counts
+    """
+    return int(np.count_nonzero(_count_codes(ctx, col)[0]))
+
+def _top_value(ctx, col):
+    """
+    Most frequent value of a column; a bincount argmax unless the full counts are already memoized
+    """
+    counts = ctx.memo.get(col)
+    if counts is not None:
+        return counts.index[0] if len(counts) > 0 else 'N/A'
+    
+    counts, uniques = _count_codes(ctx, col)
+    return uniques[counts.argmax()] if counts.any() else 'N/A'
+
+def _rate(col, needle):
+    """
+    Percentage of rows in col equal to needle, from a single vectorized comparison
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        if needle not in col.cat.categories:
+            return 0.0
+        matches = np.count_nonzero(col.cat.codes.to_numpy() == col.cat.categories.get_loc(needle))
+    elif pd.api.types.is_object_dtype(col.dtype):
+        matches = np.count_nonzero(col.to_numpy() == needle)
+    else:
+        # Arrow-backed strings compare in their own kernel; to_numpy() would box every value
+        matches = int(col.eq(needle).sum())
+    return float(matches) / max(len(col), 1) * 100
+
+def _estimate_memory_mb(df, sample_size=1000):
+    """
+    Approximate deep memory usage in MB; columns of Python string objects are scaled up from
+    evenly spaced rows, everything else (Arrow-backed strings included) is measured exactly
+    """
+    total = df.index.memory_usage(deep=False)
+    for col in df.columns:
+        series = df[col]
+        boxed = pd.api.types.is_object_dtype(series.dtype) or (
+            isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == 'python')
+        if not boxed or len(series) == 0:
+            total += series.memory_usage(deep=True, index=False)
+        else:
+            # Rows spread over the whole column, so the estimate does not follow the file order
+            sample = series.iloc[::max(len(series) // sample_size, 1)]
+            total += sample.memory_usage(deep=True, index=False) / len(sample) * len(series)
+    return total / 1024**2
+
+def _code_aggregates(ctx, key, columns, counted=()):
+    """
+    Per-key count, sum, mean and std of numeric columns from bincounts over the key's codes,
+    reading the values as one C-contiguous float64 block; counted columns get non-null counts
+    """
+    df = ctx.df
+    series = df[key]
+    codes, uniques = _codes(ctx, key)
+    valid = codes >= 0
+    codes, n = codes[valid], len(uniques)
+    groups = np.flatnonzero(_count_codes(ctx, key)[0])
+    
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        stats = pd.DataFrame({key: pd.Categorical.from_codes(groups, dtype=series.dtype)})
+    else:
+        # Factorized codes follow first appearance; report groups ordered by key. The keys are
+        # ranked with factorize's safe sort, as groupby does, so mixed-type columns still order
+        ranks, _ = pd.factorize(uniques.take(groups), sort=True)
+        groups = groups[np.argsort(ranks)]
+        stats = pd.DataFrame({key: uniques.take(groups)})
+    
+    # One row per column, so each bincount streams over contiguous memory
+    block = np.ascontiguousarray(df[columns].to_numpy(dtype='float64', na_value=np.nan)[valid].T)
+    for col, values in zip(columns, block):
+        present = ~np.isnan(values)
+        count = np.bincount(codes, weights=present, minlength=n)
+        total = np.bincount(codes, weights=np.where(present, values, 0.0), minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            deviation = np.where(present, values - mean[codes], 0.0)
+            std = np.sqrt(np.bincount(codes, weights=deviation * deviation, minlength=n) / (count - 1))
+        std[count < 2] = np.nan
+        
+        integer = pd.api.types.is_integer_dtype(df[col].dtype)
+        stats[f'{col}_sum'] = total[groups].astype('int64') if integer else total[groups]
+        stats[f'{col}_mean'] = mean[groups]
+        stats[f'{col}_std'] = std[groups]
+        stats[f'{col}_count'] = count[groups].astype('int64')
+    
+    for col in counted:
+        present = df[col].notna().to_numpy()[valid]
+        stats[f'{col}_count'] = np.bincount(codes, weights=present, minlength=n)[groups].astype('int64')
+    return stats
+
+def _revenue_table(ctx, key, name):
+    """
+    Total, mean and count of Amount per key value with the report column names
+    """
+    table = _code_aggregates(ctx, key, ['Amount'])[[key, 'Amount_sum', 'Amount_mean', 'Amount_count']].copy()
+    table.columns = [name, 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
+    return table
+
+def get_key_metrics(df, ctx=None):
     """
     Calculate key business metrics from the sales data
     """
+    # No rows: the values every metric below takes on an empty frame, without building a context
+    if len(df) == 0:
+        metrics = {'total_orders': 0, 'total_revenue': 0, 'avg_order_value': 0, 'total_quantity': 0}
+        if 'Amount' in df.columns:
+            metrics.update({'total_revenue': 0.0, 'avg_order_value': np.nan, 'revenue_std': np.nan,
+                            'median_order_value': np.nan, 'max_order_value': np.nan, 'min_order_value': np.nan})
+        if 'Category' in df.columns:
+            metrics.update({'unique_categories': 0, 'top_category': 'N/A'})
+        if 'ship-state' in df.columns:
+            metrics.update({'unique_states': 0, 'top_state': 'N/A'})
+        if 'ship-city' in df.columns:
+            metrics.update({'unique_cities': 0, 'top_city': 'N/A'})
+        if 'Status' in df.columns:
+            metrics.update({'status_distribution': {}, 'shipped_percentage': 0})
+        if 'Fulfilment' in df.columns:
+            metrics['fulfillment_distribution'] = {}
+        return metrics
+    
     metrics = {}
     
+    ctx = ctx or _AnalysisContext(df)
+    amount = ctx.amount
+    
     # Basic metrics
-    metrics['total_orders'] = len(df)
-    metrics['total_revenue'] = df['Amount'].sum() if 'Amount' in df.columns else 0
-    metrics['avg_order_value'] = df['Amount'].mean() if 'Amount' in df.columns else 0
-    metrics['total_quantity'] = df['Qty'].sum() if 'Qty' in df.columns else 0
+    metrics['total_orders'] = ctx.n
+    metrics['total_revenue'] = amount['sum'] if amount else 0
+    metrics['avg_order_value'] = amount['mean'] if amount else 0
+    metrics['total_quantity'] = ctx.qty['sum'] if ctx.qty else 0
     
     # Advanced metrics
-    if 'Amount' in df.columns:
-        metrics['revenue_std'] = df['Amount'].std()
-        metrics['median_order_value'] = df['Amount'].median()
-        metrics['max_order_value'] = df['Amount'].max()
-        metrics['min_order_value'] = df['Amount'].min()
+    if amount:
+        metrics['revenue_std'] = amount['std']
+        metrics['median_order_value'] = amount['q50']
+        metrics['max_order_value'] = amount['max']
+        metrics['min_order_value'] = amount['min']
     
     # Category metrics
     if 'Category' in df.columns:
-        metrics['unique_categories'] = df['Category'].nunique()
-        metrics['top_category'] = df['Category'].value_counts().index[0] if len(df) > 0 else 'N/A'
+        metrics['unique_categories'] = _nunique(ctx, 'Category')
+        metrics['top_category'] = _top_value(ctx, 'Category')
     
     # Geographic metrics
     if 'ship-state' in df.columns:
-        metrics['unique_states'] = df['ship-state'].nunique()
-        metrics['top_state'] = df['ship-state'].value_counts().index[0] if len(df) > 0 else 'N/A'
+        metrics['unique_states'] = _nunique(ctx, 'ship-state')
+        metrics['top_state'] = _top_value(ctx, 'ship-state')
     
     if 'ship-city' in df.columns:
-        metrics['unique_cities'] = df['ship-city'].nunique()
-        metrics['top_city'] = df['ship-city'].value_counts().index[0] if len(df) > 0 else 'N/A'
+        metrics['unique_cities'] = _nunique(ctx, 'ship-city')
+        metrics['top_city'] = _top_value(ctx, 'ship-city')
     
     # Status metrics
     if 'Status' in df.columns:
-        status_counts = df['Status'].value_counts()
+        status_counts = _value_counts(ctx, 'Status')
         metrics['status_distribution'] = status_counts.to_dict()
-        metrics['shipped_percentage'] = (status_counts.get('Shipped', 0) / len(df)) * 100 if len(df) > 0 else 0
+        metrics['shipped_percentage'] = (status_counts.get('Shipped', 0) / ctx.n) * 100 if ctx.n else 0
     
     # Fulfillment metrics
     if 'Fulfilment' in df.columns:
-        fulfillment_counts = df['Fulfilment'].value_counts()
+        fulfillment_counts = _value_counts(ctx, 'Fulfilment')
         metrics['fulfillment_distribution'] = fulfillment_counts.to_dict()
     
     return metrics
 
+def _run_starts(keys):
+    """
+    Start positions of each run of equal values in a sorted key array
+    """
+    if keys.size == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+def _run_sums(values, starts):
+    """
+    Sum of values over each run beginning at starts, via np.add.reduceat
+    """
+    if starts.size == 0:
+        return values[:0]
+    return np.add.reduceat(values, starts)
+
 def get_sales_trends(df):
     """
     Analyze sales trends over time
@@ -64,22 +300,32 @@ def get_sales_trends(df):
         # Use the first date column found
         date_col = date_columns[0]
         try:
-            df[date_col] = pd.to_datetime(df[date_col])
-            df_sorted = df.sort_values(date_col)
+            # Parse only once; the parsed column is kept on the frame for later calls
+            if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+                df[date_col] = pd.to_datetime(df[date_col], cache=True)
+            
+            # Daily trends: sort the day keys once and sum each run of equal days
+            days = df[date_col].dt.floor('D')
+            order = np.flatnonzero(days.notna().to_numpy())
+            day_keys = days.array.asi8[order]
+            sort = np.argsort(day_keys, kind='stable')
+            order, day_starts = order[sort], _run_starts(day_keys[sort])
             
-            # Daily trends
-            daily_sales = df_sorted.groupby(df_sorted[date_col].dt.date).agg({
-                'Amount': 'sum' if 'Amount' in df.columns else 'count',
-                'Qty': 'sum' if 'Qty' in df.columns else 'count'
-            }).reset_index()
+            daily_sales = pd.DataFrame({date_col: days.iloc[order[day_starts]].reset_index(drop=True)})
+            for col in ('Amount', 'Qty'):
+                if col in df.columns:
+                    daily_sales[col] = _run_sums(df[col].to_numpy(na_value=0)[order], day_starts)
+                else:
+                    daily_sales[col] = np.diff(np.append(day_starts, len(order)))
             
             trends['daily_sales'] = daily_sales
             
-            # Monthly trends
-            monthly_sales = df_sorted.groupby(df_sorted[date_col].dt.to_period('M')).agg({
-                'Amount': 'sum' if 'Amount' in df.columns else 'count',
-                'Qty': 'sum' if 'Qty' in df.columns else 'count'
-            }).reset_index()
+            # Monthly trends, rolled up from the (already sorted) daily totals
+            months = daily_sales[date_col].dt.to_period('M')
+            month_starts = _run_starts(months.array.asi8)
+            monthly_sales = pd.DataFrame({date_col: months.iloc[month_starts].reset_index(drop=True)})
+            for col in ('Amount', 'Qty'):
+                monthly_sales[col] = _run_sums(daily_sales[col].to_numpy(), month_starts)
             
             trends['monthly_sales'] = monthly_sales
             
@@ -94,203 +340,221 @@ def get_sales_trends(df):
     
     return trends
 
-def get_category_analysis(df):
+def get_category_analysis(df, ctx=None):
     """
     Perform detailed category analysis
     """
     analysis = {}
+    ctx = ctx or _AnalysisContext(df)
     
     if 'Category' in df.columns:
         # Basic category stats
-        category_counts = df['Category'].value_counts()
+        category_counts = _value_counts(ctx, 'Category')
         analysis['category_counts'] = category_counts.to_dict()
         analysis['top_categories'] = category_counts.head(10).to_dict()
         
+        # One pass over the Category codes feeds the revenue, quantity and performance tables
+        measures = [col for col in ('Amount', 'Qty') if col in df.columns]
+        counted = [col for col in ('Order ID',) if col in df.columns]
+        if measures:
+            stats = _code_aggregates(ctx, 'Category', measures, counted)
+        
         # Revenue by category
-        if 'Amount' in df.columns:
-            category_revenue = df.groupby('Category')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
+        if 'Amount' in measures:
+            category_revenue = stats[['Category', 'Amount_sum', 'Amount_mean', 'Amount_count']].copy()
             category_revenue.columns = ['Category', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
             category_revenue = category_revenue.sort_values('Total_Revenue', ascending=False)
             analysis['category_revenue'] = category_revenue
         
         # Quantity by category
-        if 'Qty' in df.columns:
-            category_qty = df.groupby('Category')['Qty'].agg(['sum', 'mean']).reset_index()
+        if 'Qty' in measures:
+            category_qty = stats[['Category', 'Qty_sum', 'Qty_mean']].copy()
             category_qty.columns = ['Category', 'Total_Qty', 'Avg_Qty']
             analysis['category_quantity'] = category_qty
         
         # Category performance metrics
-        if 'Amount' in df.columns and 'Qty' in df.columns:
-            category_performance = df.groupby('Category').agg({
-                'Amount': ['sum', 'mean', 'std'],
-                'Qty': ['sum', 'mean'],
-                'Order ID': 'count'
-            }).reset_index()
-            
-            category_performance.columns = ['Category', 'Total_Revenue', 'Avg_Revenue', 'Revenue_Std', 
-                                          'Total_Qty', 'Avg_Qty', 'Order_Count']
+        if 'Amount' in measures and 'Qty' in measures and counted:
+            category_performance = stats[['Category', 'Amount_sum', 'Amount_mean', 'Amount_std',
+                                          'Qty_sum', 'Qty_mean', 'Order ID_count']].copy()
+            category_performance.columns = ['Category', 'Total_Revenue', 'Avg_Revenue', 'Revenue_Std',
+                                            'Total_Qty', 'Avg_Qty', 'Order_Count']
             category_performance['Revenue_per_Unit'] = category_performance['Total_Revenue'] / category_performance['Total_Qty']
             
             analysis['category_performance'] = category_performance
     
     return analysis
 
-def get_shipping_analysis(df):
+def get_shipping_analysis(df, ctx=None):
     """
     Analyze shipping and fulfillment patterns
     """
     analysis = {}
+    ctx = ctx or _AnalysisContext(df)
     
     # Fulfillment analysis
     if 'Fulfilment' in df.columns:
-        fulfillment_counts = df['Fulfilment'].value_counts()
+        fulfillment_counts = _value_counts(ctx, 'Fulfilment')
         analysis['fulfillment_distribution'] = fulfillment_counts.to_dict()
         
         # Revenue by fulfillment type
         if 'Amount' in df.columns:
-            fulfillment_revenue = df.groupby('Fulfilment')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            fulfillment_revenue.columns = ['Fulfilment', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
+            fulfillment_revenue = _revenue_table(ctx, 'Fulfilment', 'Fulfilment')
             analysis['fulfillment_revenue'] = fulfillment_revenue
     
     # Courier analysis
     if 'Courier Status' in df.columns:
-        courier_counts = df['Courier Status'].value_counts()
+        courier_counts = _value_counts(ctx, 'Courier Status')
         analysis['courier_distribution'] = courier_counts.to_dict()
     
     # Service level analysis
     if 'ship-service-level' in df.columns:
-        service_counts = df['ship-service-level'].value_counts()
+        service_counts = _value_counts(ctx, 'ship-service-level')
         analysis['service_level_distribution'] = service_counts.to_dict()
         
         # Revenue by service level
         if 'Amount' in df.columns:
-            service_revenue = df.groupby('ship-service-level')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            service_revenue.columns = ['Service_Level', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
+            service_revenue = _revenue_table(ctx, 'ship-service-level', 'Service_Level')
             analysis['service_level_revenue'] = service_revenue
     
     # Geographic shipping patterns
     if 'ship-state' in df.columns:
-        state_counts = df['ship-state'].value_counts()
+        state_counts = _value_counts(ctx, 'ship-state')
         analysis['state_distribution'] = state_counts.to_dict()
         analysis['top_states'] = state_counts.head(10).to_dict()
         
         # Revenue by state
         if 'Amount' in df.columns:
-            state_revenue = df.groupby('ship-state')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            state_revenue.columns = ['State', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
+            state_revenue = _revenue_table(ctx, 'ship-state', 'State')
             state_revenue = state_revenue.sort_values('Total_Revenue', ascending=False)
             analysis['state_revenue'] = state_revenue
     
     if 'ship-city' in df.columns:
-        city_counts = df['ship-city'].value_counts()
+        city_counts = _value_counts(ctx, 'ship-city')
         analysis['city_distribution'] = city_counts.to_dict()
         analysis['top_cities'] = city_counts.head(10).to_dict()
     
     return analysis
 
-def get_product_analysis(df):
+def get_product_analysis(df, ctx=None):
     """
     Analyze product performance
     """
     analysis = {}
+    ctx = ctx or _AnalysisContext(df)
     
     # SKU analysis
     if 'SKU' in df.columns:
-        sku_counts = df['SKU'].value_counts()
+        sku_counts = _value_counts(ctx, 'SKU')
         analysis['sku_distribution'] = sku_counts.to_dict()
         analysis['top_skus'] = sku_counts.head(10).to_dict()
         
         # Revenue by SKU
         if 'Amount' in df.columns:
-            sku_revenue = df.groupby('SKU')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            sku_revenue.columns = ['SKU', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
-            sku_revenue = sku_revenue.sort_values('Total_Revenue', ascending=False)
-            analysis['sku_revenue'] = sku_revenue.head(20)  # Top 20 SKUs
+            sku_revenue = _revenue_table(ctx, 'SKU', 'SKU')
+            analysis['sku_revenue'] = sku_revenue.nlargest(20, 'Total_Revenue')  # Top 20 SKUs
     
     # ASIN analysis
     if 'ASIN' in df.columns:
-        asin_counts = df['ASIN'].value_counts()
+        asin_counts = _value_counts(ctx, 'ASIN')
         analysis['asin_distribution'] = asin_counts.to_dict()
         analysis['top_asins'] = asin_counts.head(10).to_dict()
         
         # Revenue by ASIN
         if 'Amount' in df.columns:
-            asin_revenue = df.groupby('ASIN')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            asin_revenue.columns = ['ASIN', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
-            asin_revenue = asin_revenue.sort_values('Total_Revenue', ascending=False)
-            analysis['asin_revenue'] = asin_revenue.head(20)  # Top 20 ASINs
+            asin_revenue = _revenue_table(ctx, 'ASIN', 'ASIN')
+            analysis['asin_revenue'] = asin_revenue.nlargest(20, 'Total_Revenue')  # Top 20 ASINs
     
     # Style analysis
     if 'Style' in df.columns:
-        style_counts = df['Style'].value_counts()
+        style_counts = _value_counts(ctx, 'Style')
         analysis['style_distribution'] = style_counts.to_dict()
         analysis['top_styles'] = style_counts.head(10).to_dict()
     
     # Size analysis
     if 'Size' in df.columns:
-        size_counts = df['Size'].value_counts()
+        size_counts = _value_counts(ctx, 'Size')
         analysis['size_distribution'] = size_counts.to_dict()
         analysis['top_sizes'] = size_counts.head(10).to_dict()
         
         # Revenue by size
         if 'Amount' in df.columns:
-            size_revenue = df.groupby('Size')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            size_revenue.columns = ['Size', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
+            size_revenue = _revenue_table(ctx, 'Size', 'Size')
             size_revenue = size_revenue.sort_values('Total_Revenue', ascending=False)
             analysis['size_revenue'] = size_revenue
     
     return analysis
 
-def get_revenue_analysis(df):
+def get_revenue_analysis(df, ctx=None):
     """
     Detailed revenue analysis
     """
     analysis = {}
     
+    # No rows: every statistic of an empty Amount column, without extracting it
+    if 'Amount' in df.columns and len(df) == 0:
+        analysis = {
+            'total_revenue': 0.0,
+            'avg_revenue': np.nan,
+            'median_revenue': np.nan,
+            'revenue_std': np.nan,
+            'max_revenue': np.nan,
+            'min_revenue': np.nan,
+            'revenue_quartiles': {0.25: np.nan, 0.5: np.nan, 0.75: np.nan},
+            'high_value_orders': 0,
+            'medium_value_orders': 0,
+            'low_value_orders': 0
+        }
+        if 'currency' in df.columns:
+            analysis['currency_revenue'] = pd.DataFrame(columns=['Currency', 'Total_Revenue', 'Avg_Revenue', 'Order_Count'])
+        return analysis
+    
     if 'Amount' in df.columns:
+        ctx = ctx or _AnalysisContext(df)
+        amount = ctx.amount
+        values = amount['values']
+        
         # Basic revenue statistics
-        analysis['total_revenue'] = df['Amount'].sum()
-        analysis['avg_revenue'] = df['Amount'].mean()
-        analysis['median_revenue'] = df['Amount'].median()
-        analysis['revenue_std'] = df['Amount'].std()
-        analysis['max_revenue'] = df['Amount'].max()
-        analysis['min_revenue'] = df['Amount'].min()
+        analysis['total_revenue'] = amount['sum']
+        analysis['avg_revenue'] = amount['mean']
+        analysis['median_revenue'] = amount['q50']
+        analysis['revenue_std'] = amount['std']
+        analysis['max_revenue'] = amount['max']
+        analysis['min_revenue'] = amount['min']
         
         # Revenue distribution
-        analysis['revenue_quartiles'] = df['Amount'].quantile([0.25, 0.5, 0.75]).to_dict()
+        analysis['revenue_quartiles'] = {0.25: amount['q25'], 0.5: amount['q50'], 0.75: amount['q75']}
         
         # Revenue segments
-        analysis['high_value_orders'] = len(df[df['Amount'] > df['Amount'].quantile(0.9)])
-        analysis['medium_value_orders'] = len(df[(df['Amount'] >= df['Amount'].quantile(0.5)) & 
-                                               (df['Amount'] <= df['Amount'].quantile(0.9))])
-        analysis['low_value_orders'] = len(df[df['Amount'] < df['Amount'].quantile(0.5)])
+        analysis['high_value_orders'] = np.count_nonzero(values > amount['q90'])
+        analysis['medium_value_orders'] = np.count_nonzero((values >= amount['q50']) & (values <= amount['q90']))
+        analysis['low_value_orders'] = np.count_nonzero(values < amount['q50'])
         
         # Revenue by currency
         if 'currency' in df.columns:
-            currency_revenue = df.groupby('currency')['Amount'].agg(['sum', 'mean', 'count']).reset_index()
-            currency_revenue.columns = ['Currency', 'Total_Revenue', 'Avg_Revenue', 'Order_Count']
-            analysis['currency_revenue'] = currency_revenue
+            # Accumulated in float64 even when Amount is stored as float32, as the dashboard loads it
+            analysis['currency_revenue'] = _revenue_table(ctx, 'currency', 'Currency')
     
     return analysis
 
-def get_customer_insights(df):
+def get_customer_insights(df, ctx=None):
     """
     Generate customer-related insights
     """
     insights = {}
+    ctx = ctx or _AnalysisContext(df)
+    total_orders = ctx.n
     
     # Geographic customer distribution
     if 'ship-state' in df.columns:
-        state_customers = df['ship-state'].value_counts()
+        state_customers = _value_counts(ctx, 'ship-state')
         insights['customers_by_state'] = state_customers.to_dict()
         
         # Customer concentration
-        total_orders = len(df)
         top_5_states = state_customers.head(5).sum()
         insights['top_5_states_concentration'] = (top_5_states / total_orders) * 100
     
     if 'ship-city' in df.columns:
-        city_customers = df['ship-city'].value_counts()
+        city_customers = _value_counts(ctx, 'ship-city')
         insights['customers_by_city'] = city_customers.to_dict()
         
         # Customer concentration by city
@@ -304,35 +568,48 @@ def get_customer_insights(df):
     
     # Country analysis
     if 'ship-country' in df.columns:
-        country_customers = df['ship-country'].value_counts()
+        country_customers = _value_counts(ctx, 'ship-country')
         insights['customers_by_country'] = country_customers.to_dict()
     
     return insights
 
-def get_advanced_analytics(df):
+def get_geographic_analysis(df):
+    """
+    Shipping and customer analyses on one shared context, so ship-state and ship-city
+    are factorized and counted once for both
+    """
+    ctx = _AnalysisContext(df)
+    return {
+        'shipping': get_shipping_analysis(df, ctx),
+        'customers': get_customer_insights(df, ctx)
+    }
+
+def get_advanced_analytics(df, ctx=None):
     """
     Advanced analytics and business insights
     """
     analytics = {}
+    ctx = ctx or _AnalysisContext(df)
+    n = ctx.n
     
     # Order size analysis
     if 'Qty' in df.columns:
-        analytics['avg_order_size'] = df['Qty'].mean()
-        analytics['order_size_distribution'] = df['Qty'].value_counts().to_dict()
+        analytics['avg_order_size'] = ctx.qty['mean']
+        analytics['order_size_distribution'] = _value_counts(ctx, 'Qty').to_dict()
         
         # Bulk orders (orders with quantity > 1)
-        bulk_orders = df[df['Qty'] > 1]
-        analytics['bulk_orders_count'] = len(bulk_orders)
-        analytics['bulk_orders_percentage'] = (len(bulk_orders) / len(df)) * 100
+        bulk_orders = int((df['Qty'] > 1).sum())
+        analytics['bulk_orders_count'] = bulk_orders
+        analytics['bulk_orders_percentage'] = (bulk_orders / n) * 100 if n else 0
     
     # Status analysis
     if 'Status' in df.columns:
-        status_dist = df['Status'].value_counts()
+        status_dist = _value_counts(ctx, 'Status')
         analytics['status_distribution'] = status_dist.to_dict()
         
         # Calculate fulfillment rate
         if 'Shipped' in status_dist.index:
-            analytics['fulfillment_rate'] = (status_dist['Shipped'] / len(df)) * 100
+            analytics['fulfillment_rate'] = (status_dist['Shipped'] / n) * 100
     
     # Sales channel effectiveness
     if 'Sales Channel' in df.columns:
@@ -350,16 +627,16 @@ def get_advanced_analytics(df):
     
     # Product diversity
     if 'Category' in df.columns:
-        analytics['product_diversity'] = df['Category'].nunique()
+        analytics['product_diversity'] = _nunique(ctx, 'Category')
         
         # Category concentration
-        category_counts = df['Category'].value_counts()
+        category_counts = _value_counts(ctx, 'Category')
         top_3_categories = category_counts.head(3).sum()
-        analytics['top_3_categories_concentration'] = (top_3_categories / len(df)) * 100
+        analytics['top_3_categories_concentration'] = (top_3_categories / n) * 100 if n else 0
     
     # Size preferences
     if 'Size' in df.columns:
-        size_preferences = df['Size'].value_counts()
+        size_preferences = _value_counts(ctx, 'Size')
         analytics['size_preferences'] = size_preferences.to_dict()
         analytics['most_popular_size'] = size_preferences.index[0] if len(size_preferences) > 0 else 'N/A'
     
@@ -376,39 +653,44 @@ def generate_summary_report(df):
         'total_records': len(df),
         'total_columns': len(df.columns),
         'date_range': 'N/A',  # Will be updated if date column exists
-        'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2
+        'memory_usage_mb': _estimate_memory_mb(df)
     }
     
+    # One context for the whole report, so every section reuses the same codes, counts and Amount summary
+    ctx = _AnalysisContext(df)
+    
     # Business metrics
-    report['business_metrics'] = get_key_metrics(df)
+    report['business_metrics'] = get_key_metrics(df, ctx)
     
     # Top performers
     report['top_performers'] = {}
     
+    # Category and state counts were already memoized by the key metrics pass
     if 'Category' in df.columns:
-        report['top_performers']['categories'] = df['Category'].value_counts().head(5).to_dict()
+        report['top_performers']['categories'] = _value_counts(ctx, 'Category').head(5).to_dict()
     
     if 'ship-state' in df.columns:
-        report['top_performers']['states'] = df['ship-state'].value_counts().head(5).to_dict()
+        report['top_performers']['states'] = _value_counts(ctx, 'ship-state').head(5).to_dict()
     
     if 'SKU' in df.columns:
+        # Nothing else in the report counts SKUs, so a plain value_counts beats factorizing them
         report['top_performers']['skus'] = df['SKU'].value_counts().head(5).to_dict()
     
     # Revenue insights
     if 'Amount' in df.columns:
-        report['revenue_insights'] = get_revenue_analysis(df)
+        report['revenue_insights'] = get_revenue_analysis(df, ctx)
     
     # Operational insights
     report['operational_insights'] = {}
     
     if 'Fulfilment' in df.columns:
-        report['operational_insights']['fulfillment'] = df['Fulfilment'].value_counts().to_dict()
+        report['operational_insights']['fulfillment'] = _value_counts(ctx, 'Fulfilment').to_dict()
     
     if 'Courier Status' in df.columns:
-        report['operational_insights']['courier_status'] = df['Courier Status'].value_counts().to_dict()
+        report['operational_insights']['courier_status'] = _value_counts(ctx, 'Courier Status').to_dict()
     
     if 'Status' in df.columns:
-        report['operational_insights']['order_status'] = df['Status'].value_counts().to_dict()
+        report['operational_insights']['order_status'] = _value_counts(ctx, 'Status').to_dict()
     
     return report
 
@@ -417,53 +699,60 @@ def create_executive_summary(df):
     Create an executive summary for stakeholders
     """
     summary = {}
+    ctx = _AnalysisContext(df)
     
     # Key highlights
     summary['key_highlights'] = []
     
     # Total business volume
-    total_orders = len(df)
+    total_orders = ctx.n
     summary['key_highlights'].append(f"Processed {total_orders:,} orders")
     
     if 'Amount' in df.columns:
-        total_revenue = df['Amount'].sum()
-        avg_order_value = df['Amount'].mean()
+        total_revenue = ctx.amount_totals['sum']
+        avg_order_value = ctx.amount_totals['mean']
         summary['key_highlights'].append(f"Generated ${total_revenue:,.2f} in total revenue")
         summary['key_highlights'].append(f"Average order value: ${avg_order_value:.2f}")
     
     # Geographic reach
     if 'ship-state' in df.columns:
-        unique_states = df['ship-state'].nunique()
+        unique_states = _nunique(ctx, 'ship-state')
         summary['key_highlights'].append(f"Served customers in {unique_states} states")
     
     if 'ship-city' in df.columns:
-        unique_cities = df['ship-city'].nunique()
+        unique_cities = _nunique(ctx, 'ship-city')
         summary['key_highlights'].append(f"Delivered to {unique_cities} cities")
     
     # Product diversity
     if 'Category' in df.columns:
-        unique_categories = df['Category'].nunique()
+        unique_categories = _nunique(ctx, 'Category')
         summary['key_highlights'].append(f"Sold products across {unique_categories} categories")
     
     # Operational performance
     if 'Status' in df.columns:
-        status_counts = df['Status'].value_counts()
-        if 'Shipped' in status_counts.index:
-            shipped_rate = (status_counts['Shipped'] / total_orders) * 100
+        shipped_rate = _rate(df['Status'], 'Shipped')
+        if shipped_rate > 0:
             summary['key_highlights'].append(f"Achieved {shipped_rate:.1f}% shipping rate")
     
     # Growth opportunities
     summary['growth_opportunities'] = []
     
     if 'Category' in df.columns and 'Amount' in df.columns:
-        category_revenue = df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-        top_category = category_revenue.index[0]
-        summary['growth_opportunities'].append(f"Focus on expanding {top_category} category")
+        # Only the largest total matters: one weighted bincount over the codes, no means or spreads
+        codes, uniques = _codes(ctx, 'Category')
+        valid = codes >= 0
+        amounts = df['Amount'].to_numpy(dtype='float64', na_value=0.0)[valid]
+        category_revenue = np.bincount(codes[valid], weights=amounts, minlength=len(uniques))
+        observed = _count_codes(ctx, 'Category')[0] > 0
+        if observed.any():
+            top_category = uniques[np.where(observed, category_revenue, -np.inf).argmax()]
+            summary['growth_opportunities'].append(f"Focus on expanding {top_category} category")
     
     if 'ship-state' in df.columns:
-        state_counts = df['ship-state'].value_counts()
-        underserved_states = state_counts[state_counts < state_counts.quantile(0.25)]
-        if len(underserved_states) > 0:
-            summary['growth_opportunities'].append(f"Opportunity to expand in {len(underserved_states)} underserved states")
+        state_counts = _count_codes(ctx, 'ship-state')[0]
+        state_counts = state_counts[state_counts > 0]
+        underserved_states = np.count_nonzero(state_counts < np.quantile(state_counts, 0.25)) if state_counts.size else 0
+        if underserved_states > 0:
+            summary['growth_opportunities'].append(f"Opportunity to expand in {underserved_states} underserved states")
     
     return summary